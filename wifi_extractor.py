@@ -1,15 +1,61 @@
 import subprocess
-import re
 import json
 import csv
+import io
+import math
 import os
+import sys
+import threading
 import ctypes
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import closing
 from datetime import datetime
-from typing import List, Dict, Optional
-from dataclasses import dataclass
+from functools import lru_cache
+from typing import Callable, List, Dict, Iterable, Iterator, Optional, Tuple
+from dataclasses import dataclass, field
 
 
-@dataclass
+# Разделитель между выводами netsh в пакетной команде
+PROFILE_SEPARATOR = '===PROFILE_SEP==='
+
+# Число параллельных команд и предельное количество профилей в одной пакетной
+# команде (ограничивает длину командной строки cmd)
+MAX_WORKERS = 8
+MAX_DETAILS_BATCH_SIZE = 16
+
+# Время жизни закешированных деталей профиля (в секундах)
+DETAILS_CACHE_TTL = 60
+
+# Соответствие полей вывода netsh полям WifiProfile
+FIELD_MAP = {
+    'Authentication': 'authentication',
+    'Проверка подлинности': 'authentication',
+    'Cipher': 'encryption',
+    'Шифр': 'encryption',
+    'Key Content': 'key',
+    'Содержимое ключа': 'key',
+    'Key Type': 'key_type',
+    'Тип ключа': 'key_type',
+    'Profile Type': 'profile_type',
+    'Тип профиля': 'profile_type'
+}
+
+# Значения ключа, означающие отсутствие сохранённого пароля
+NO_PASSWORD_KEYS = frozenset({'No password saved', 'Not found'})
+
+# Префикс строки с именем профиля в выводе netsh wlan show profiles
+USER_PROFILE_PREFIX = 'Все профили пользователей'
+
+# Поля WifiProfile, попадающие в JSON экспорт
+EXPORT_FIELDS = ('ssid', 'authentication', 'encryption', 'key', 'key_type', 'profile_type', 'last_modified')
+
+# __slots__ для dataclass доступны начиная с Python 3.10
+_DATACLASS_SLOTS = {'slots': True} if sys.version_info >= (3, 10) else {}
+
+
+@dataclass(frozen=True, **_DATACLASS_SLOTS)
 class WifiProfile:
     """Класс для представления профиля Wi-Fi"""
     ssid: str
@@ -19,18 +65,27 @@ class WifiProfile:
     key_type: str
     profile_type: str
     last_modified: str = ""
+    # Вычисляемые поля для быстрой фильтрации
+    ssid_lower: str = field(init=False, repr=False, compare=False)
+    has_password: bool = field(init=False, repr=False, compare=False)
+    
+    def __post_init__(self):
+        # Класс заморожен, поэтому вычисляемые поля задаются через object.__setattr__
+        object.__setattr__(self, 'ssid_lower', self.ssid.lower())
+        object.__setattr__(self, 'has_password', bool(self.key) and self.key not in NO_PASSWORD_KEYS)
     
     def to_dict(self) -> Dict:
         """Преобразование в словарь для JSON экспорта"""
-        return {
-            'ssid': self.ssid,
-            'authentication': self.authentication,
-            'encryption': self.encryption,
-            'key': self.key,
-            'key_type': self.key_type,
-            'profile_type': self.profile_type,
-            'last_modified': self.last_modified
-        }
+        return {name: getattr(self, name) for name in EXPORT_FIELDS}
+
+
+@lru_cache(maxsize=1)
+def _check_admin_rights() -> bool:
+    """Проверка прав администратора (не меняется за время работы процесса)"""
+    try:
+        return bool(ctypes.windll.shell32.IsUserAnAdmin())
+    except:
+        return False
 
 
 class WifiExtractor:
@@ -38,36 +93,36 @@ class WifiExtractor:
     
     def __init__(self):
         self.profiles: List[WifiProfile] = []
-        self.is_admin = self._check_admin_rights()
-    
-    def _check_admin_rights(self) -> bool:
-        """Проверка прав администратора"""
-        try:
-            return ctypes.windll.shell32.IsUserAnAdmin()
-        except:
-            return False
+        # Кеш деталей профилей: SSID -> (время получения, профиль)
+        self._details_cache: Dict[str, Tuple[float, WifiProfile]] = {}
+        self._extract_lock = threading.Lock()
+        self.is_admin = _check_admin_rights()
     
-    def _run_command(self, command: str) -> str:
-        """Выполнение команды и возврат результата"""
+    def _run_command(self, command: str) -> Iterator[str]:
+        """Выполнение команды с построчным чтением вывода"""
         try:
-            result = subprocess.run(
+            process = subprocess.Popen(
                 command,
                 shell=True,
-                capture_output=True,
-                text=True,
-                encoding='cp866'  # Кодировка для Windows консоли
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
+                # Без всплывающего окна консоли (флаг есть только на Windows)
+                creationflags=getattr(subprocess, 'CREATE_NO_WINDOW', 0)
             )
-            if result.returncode == 0:
-                return result.stdout
-            else:
-                return f"Error: {result.stderr}"
         except Exception as e:
-            return f"Exception: {str(e)}"
+            print(f"Error running command: {e}")
+            return
+        
+        with process:
+            # Кодировка для Windows консоли
+            yield from io.TextIOWrapper(process.stdout, encoding='cp866')
+        
+        if process.returncode != 0:
+            print(f"Error: command exited with code {process.returncode}: {command}")
     
-    def _parse_profile_list(self, output: str) -> List[str]:
+    def _parse_profile_list(self, lines: Iterable[str]) -> List[str]:
         """Парсинг списка профилей из вывода netsh с секцией 'Профили пользователей'"""
         profiles = []
-        lines = output.split('\n')
         in_user_profiles_section = False
 
         for line in lines:
@@ -82,16 +137,18 @@ class WifiExtractor:
                 if not line or line.startswith('Профили групповой политики'):
                     break
                 # Ищем строку с профилем
-                match = re.search(r'Все профили пользователей\s*:\s*(.+)', line)
-                if match:
-                    profiles.append(match.group(1).strip())
+                if line.startswith(USER_PROFILE_PREFIX):
+                    name = line.partition(':')[2].strip()
+                    if name:
+                        profiles.append(name)
 
         return profiles
     
-    def _parse_profile_details(self, output: str, profile_name: str) -> Optional[WifiProfile]:
-        """Парсинг деталей профиля"""
-        lines = output.split('\n')
+    def _parse_profile_details(self, lines: Iterator[str], profile_name: str) -> Optional[WifiProfile]:
+        """Парсинг деталей профиля (читает строки до разделителя PROFILE_SEPARATOR)
         
+        Возвращает None, если в выводе не найдено ни одного поля (команда не выполнилась).
+        """
         profile_data = {
             'ssid': profile_name,
             'authentication': 'Unknown',
@@ -101,66 +158,108 @@ class WifiExtractor:
             'profile_type': 'Unknown',
             'last_modified': ''
         }
+        parsed = False
         
         for line in lines:
-            line = line.strip()
-            
-            # Аутентификация
-            if 'Authentication' in line or 'Проверка подлинности' in line:
-                match = re.search(r':\s*(.+)', line)
-                if match:
-                    profile_data['authentication'] = match.group(1).strip()
-            
-            # Шифрование
-            elif 'Cipher' in line or 'Шифр' in line:
-                match = re.search(r':\s*(.+)', line)
-                if match:
-                    profile_data['encryption'] = match.group(1).strip()
-            
-            # Ключ безопасности
-            elif 'Key Content' in line or 'Содержимое ключа' in line:
-                match = re.search(r':\s*(.+)', line)
-                if match:
-                    key_content = match.group(1).strip()
-                    if key_content and key_content != 'Absent':
-                        profile_data['key'] = key_content
-                    else:
-                        profile_data['key'] = 'No password saved'
-            
-            # Тип ключа
-            elif 'Key Type' in line or 'Тип ключа' in line:
-                match = re.search(r':\s*(.+)', line)
-                if match:
-                    profile_data['key_type'] = match.group(1).strip()
+            if line.startswith(PROFILE_SEPARATOR):
+                break
+            # Строку целиком не обрезаем: пробелы снимаются только с ключа и значения
+            key, _, value = line.partition(':')
+            profile_field = FIELD_MAP.get(key.strip())
+            if not profile_field:
+                continue
+            value = value.strip()
             
-            # Тип профиля
-            elif 'Profile Type' in line or 'Тип профиля' in line:
-                match = re.search(r':\s*(.+)', line)
-                if match:
-                    profile_data['profile_type'] = match.group(1).strip()
+            # Ключ безопасности: пустое значение или Absent — пароль не сохранён
+            if profile_field == 'key':
+                if not value or value == 'Absent':
+                    value = 'No password saved'
+            elif not value:
+                continue
+            profile_data[profile_field] = value
+            parsed = True
         
+        if not parsed:
+            return None
         return WifiProfile(**profile_data)
     
-    def extract_profiles(self) -> List[WifiProfile]:
-        """Основной метод извлечения профилей"""
+    def _build_details_command(self, profile_names: List[str]) -> str:
+        """Сборка одной команды для получения деталей всех профилей"""
+        return ' & '.join(
+            f'netsh wlan show profile name="{name}" key=clear & echo {PROFILE_SEPARATOR}'
+            for name in profile_names
+        )
+    
+    def _fetch_profiles(self, profile_names: List[str]) -> List[WifiProfile]:
+        """Получение деталей группы профилей одним запуском оболочки"""
+        details_lines = self._run_command(self._build_details_command(profile_names))
+        
+        profiles = []
+        for profile_name in profile_names:
+            profile = self._parse_profile_details(details_lines, profile_name)
+            if profile:
+                profiles.append(profile)
+        return profiles
+    
+    def extract_profiles(self, progress_callback: Optional[Callable[[int, int], None]] = None,
+                         force_refresh: bool = False) -> List[WifiProfile]:
+        """Основной метод извлечения профилей
+        
+        progress_callback вызывается с числом обработанных и общим числом профилей.
+        Детали профилей, полученные не раньше DETAILS_CACHE_TTL секунд назад, берутся
+        из кеша; force_refresh=True запрашивает их заново.
+        """
         if not self.is_admin:
             raise PermissionError("Необходимы права администратора для доступа к Wi-Fi профилям")
         
+        # Одновременно выполняется только одно извлечение: запуски делят кеш деталей
+        with self._extract_lock:
+            return self._extract_profiles(progress_callback, force_refresh)
+    
+    def _extract_profiles(self, progress_callback: Optional[Callable[[int, int], None]],
+                          force_refresh: bool) -> List[WifiProfile]:
+        """Извлечение профилей (вызывается под self._extract_lock)"""
         # Получаем список всех профилей
-        profiles_output = self._run_command("netsh wlan show profiles")
-        profile_names = self._parse_profile_list(profiles_output)
+        # Парсер выходит из цикла досрочно, поэтому процесс закрываем сразу после него
+        with closing(self._run_command("netsh wlan show profiles")) as profiles_output:
+            profile_names = self._parse_profile_list(profiles_output)
         print(profile_names)
         
-        self.profiles = []
+        # Новый кеш собирается локально: удалённые из системы профили в него не попадают
+        old_cache = {} if force_refresh else self._details_cache
+        cache = {name: old_cache[name] for name in profile_names if name in old_cache}
         
-        for profile_name in profile_names:
-            # Получаем детали каждого профиля
-            details_command = f'netsh wlan show profile name="{profile_name}" key=clear'
-            details_output = self._run_command(details_command)
-            
-            profile = self._parse_profile_details(details_output, profile_name)
-            if profile:
-                self.profiles.append(profile)
+        # Запрашиваем детали только для новых и устаревших профилей
+        now = time.monotonic()
+        names_to_fetch = [
+            name for name in profile_names
+            if name not in cache or now - cache[name][0] > DETAILS_CACHE_TTL
+        ]
+        
+        # Распределяем профили по пакетам поровну между потоками
+        batch_size = min(math.ceil(len(names_to_fetch) / MAX_WORKERS), MAX_DETAILS_BATCH_SIZE) or 1
+        batches = [
+            names_to_fetch[i:i + batch_size]
+            for i in range(0, len(names_to_fetch), batch_size)
+        ]
+        processed = len(profile_names) - len(names_to_fetch)
+        with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+            futures = {executor.submit(self._fetch_profiles, batch): batch for batch in batches}
+            for future in as_completed(futures):
+                fetched_at = time.monotonic()
+                for profile in future.result():
+                    cache[profile.ssid] = (fetched_at, profile)
+                processed += len(futures[future])
+                if progress_callback:
+                    progress_callback(processed, len(profile_names))
+        
+        # Профили без деталей не кешируются и запрашиваются повторно при следующем обновлении
+        failed = [name for name in names_to_fetch if name not in cache]
+        if failed:
+            print(f"Error: failed to get details for profiles: {failed}")
+        
+        self._details_cache = cache
+        self.profiles = [cache[name][1] for name in profile_names if name in cache]
         
         return self.profiles
     
@@ -169,13 +268,11 @@ class WifiExtractor:
         filtered = self.profiles
         
         if has_password is not None:
-            if has_password:
-                filtered = [p for p in filtered if p.key and p.key != 'No password saved' and p.key != 'Not found']
-            else:
-                filtered = [p for p in filtered if not p.key or p.key == 'No password saved' or p.key == 'Not found']
+            filtered = [p for p in filtered if p.has_password == has_password]
         
         if ssid_filter:
-            filtered = [p for p in filtered if ssid_filter.lower() in p.ssid.lower()]
+            ssid_filter = ssid_filter.lower()
+            filtered = [p for p in filtered if ssid_filter in p.ssid_lower]
         
         return filtered
     
@@ -190,15 +287,19 @@ class WifiExtractor:
                 f.write(f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
                 f.write(f"Total profiles: {len(profiles)}\n\n")
                 
-                for i, profile in enumerate(profiles, 1):
-                    f.write(f"Profile #{i}\n")
-                    f.write(f"SSID: {profile.ssid}\n")
-                    f.write(f"Authentication: {profile.authentication}\n")
-                    f.write(f"Encryption: {profile.encryption}\n")
-                    f.write(f"Key: {profile.key}\n")
-                    f.write(f"Key Type: {profile.key_type}\n")
-                    f.write(f"Profile Type: {profile.profile_type}\n")
-                    f.write("-" * 40 + "\n\n")
+                separator = "-" * 40
+                parts = [
+                    f"Profile #{i}\n"
+                    f"SSID: {profile.ssid}\n"
+                    f"Authentication: {profile.authentication}\n"
+                    f"Encryption: {profile.encryption}\n"
+                    f"Key: {profile.key}\n"
+                    f"Key Type: {profile.key_type}\n"
+                    f"Profile Type: {profile.profile_type}\n"
+                    f"{separator}\n\n"
+                    for i, profile in enumerate(profiles, 1)
+                ]
+                f.write(''.join(parts))
             
             return True
         except Exception as e:
@@ -213,26 +314,21 @@ class WifiExtractor:
         try:
             with open(filename, 'w', newline='', encoding='utf-8') as csvfile:
                 fieldnames = ['SSID', 'Authentication', 'Encryption', 'Key', 'Key Type', 'Profile Type']
-                writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
+                writer = csv.writer(csvfile)
                 
-                writer.writeheader()
-                for profile in profiles:
-                    writer.writerow({
-                        'SSID': profile.ssid,
-                        'Authentication': profile.authentication,
-                        'Encryption': profile.encryption,
-                        'Key': profile.key,
-                        'Key Type': profile.key_type,
-                        'Profile Type': profile.profile_type
-                    })
+                writer.writerow(fieldnames)
+                writer.writerows(
+                    (p.ssid, p.authentication, p.encryption, p.key, p.key_type, p.profile_type)
+                    for p in profiles
+                )
             
             return True
         except Exception as e:
             print(f"Error saving to CSV: {e}")
             return False
     
-    def export_to_json(self, filename: str, profiles: List[WifiProfile] = None) -> bool:
-        """Экспорт в JSON файл"""
+    def export_to_json(self, filename: str, profiles: List[WifiProfile] = None, pretty: bool = False) -> bool:
+        """Экспорт в JSON файл (pretty=True — с отступами, но медленнее)"""
         if profiles is None:
             profiles = self.profiles
         
@@ -244,7 +340,11 @@ class WifiExtractor:
             }
             
             with open(filename, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=2, ensure_ascii=False)
+                if pretty:
+                    json.dump(data, f, indent=2, ensure_ascii=False)
+                else:
+                    # json.dumps без отступов использует быстрый C-кодировщик
+                    f.write(json.dumps(data, ensure_ascii=False, separators=(',', ':')))
             
             return True
         except Exception as e:
@@ -254,13 +354,10 @@ class WifiExtractor:
     def get_stats(self) -> Dict:
         """Получение статистики по профилям"""
         total = len(self.profiles)
-        with_password = len([p for p in self.profiles if p.key and p.key != 'No password saved' and p.key != 'Not found'])
+        with_password = sum(1 for p in self.profiles if p.has_password)
         without_password = total - with_password
         
-        auth_types = {}
-        for profile in self.profiles:
-            auth_type = profile.authentication
-            auth_types[auth_type] = auth_types.get(auth_type, 0) + 1
+        auth_types = dict(Counter(p.authentication for p in self.profiles))
         
         return {
             'total_profiles': total,
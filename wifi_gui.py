@@ -6,6 +6,10 @@ from typing import List
 from wifi_extractor import WifiExtractor, WifiProfile
 
 
+# Задержка применения фильтров при вводе (в секундах)
+FILTER_DEBOUNCE_DELAY = 0.15
+
+
 class WifiDumpGUI:
     """Графический интерфейс для Wi-Fi Dump утилиты"""
     
@@ -14,6 +18,13 @@ class WifiDumpGUI:
         self.extractor = WifiExtractor()
         self.profiles = []
         self.filtered_profiles = []
+        self._filter_timer = None
+        # Номер последнего отложенного фильтра: устаревшие срабатывания таймера пропускаются
+        self._filter_generation = 0
+        # Обновление списка профилей и таблицы выполняется только под этой блокировкой
+        self._ui_lock = threading.Lock()
+        self._row_cache = {}
+        self._cached_stats = None
         
         # Настройка страницы
         self.page.title = "Wi-Fi Dump - Extractor"
@@ -73,7 +84,7 @@ class WifiDumpGUI:
         self.filter_ssid = ft.TextField(
             label="Filter by SSID",
             hint_text="Enter SSID to filter...",
-            on_change=self.apply_filters,
+            on_change=self.schedule_filters,
             width=250
         )
         
@@ -199,17 +210,25 @@ class WifiDumpGUI:
     
     def extract_profiles(self, e):
         """Извлечение профилей Wi-Fi"""
+        self.start_extraction(force_refresh=True)
+    
+    def start_extraction(self, force_refresh):
+        """Запуск извлечения профилей"""
         self.show_progress("Extracting Wi-Fi profiles...")
         
         # Запуск в отдельном потоке
-        threading.Thread(target=self._extract_profiles_thread, daemon=True).start()
+        threading.Thread(target=self._extract_profiles_thread, args=(force_refresh,), daemon=True).start()
     
-    def _extract_profiles_thread(self):
+    def _extract_profiles_thread(self, force_refresh):
         """Поток для извлечения профилей"""
         try:
-            profiles = self.extractor.extract_profiles()
-            self.profiles = profiles
-            self.filtered_profiles = profiles
+            profiles = self.extractor.extract_profiles(
+                progress_callback=self._update_progress,
+                force_refresh=force_refresh
+            )
+            with self._ui_lock:
+                self.profiles = profiles
+                self.filtered_profiles = profiles
             
             # Обновляем UI в главном потоке
             self.page.run_thread(self._update_ui_after_extraction)
@@ -217,10 +236,20 @@ class WifiDumpGUI:
         except Exception as ex:
             self.page.run_thread(lambda: self.show_error(f"Error: {str(ex)}"))
     
+    def _update_progress(self, processed, total):
+        """Обновление прогресса извлечения"""
+        self.progress_bar.value = processed / total
+        self.status_text.value = f"Extracting Wi-Fi profiles... {processed}/{total}"
+        self.page.update()
+    
     def _update_ui_after_extraction(self):
         """Обновление UI после извлечения"""
-        self.update_table()
-        self.update_stats()
+        with self._ui_lock:
+            self._row_cache = {}
+            # Статистика по всем профилям не меняется при фильтрации
+            self._cached_stats = self.extractor.get_stats()
+            self.update_table()
+            self.update_stats()
         self.enable_export_buttons()
         self.refresh_btn.disabled = False
         self.hide_progress()
@@ -228,11 +257,40 @@ class WifiDumpGUI:
         self.page.update()
     
     def refresh_profiles(self, e):
-        """Обновление списка профилей"""
-        self.extract_profiles(e)
+        """Обновление списка профилей (детали берутся из кеша, если не устарели)"""
+        self.start_extraction(force_refresh=False)
+    
+    def schedule_filters(self, e):
+        """Применение фильтров с задержкой, чтобы не перерисовывать таблицу на каждое нажатие"""
+        with self._ui_lock:
+            if self._filter_timer:
+                self._filter_timer.cancel()
+            
+            self._filter_generation += 1
+            self._filter_timer = threading.Timer(
+                FILTER_DEBOUNCE_DELAY,
+                self._apply_scheduled_filters,
+                args=(self._filter_generation,)
+            )
+            self._filter_timer.daemon = True
+            self._filter_timer.start()
+    
+    def _apply_scheduled_filters(self, generation):
+        """Применение отложенных фильтров, если после них не было нового ввода"""
+        with self._ui_lock:
+            if generation != self._filter_generation:
+                return
+            self._apply_filters()
+        self.page.update()
     
     def apply_filters(self, e):
         """Применение фильтров"""
+        with self._ui_lock:
+            self._apply_filters()
+        self.page.update()
+    
+    def _apply_filters(self):
+        """Фильтрация профилей и обновление таблицы (вызывается под self._ui_lock)"""
         if not self.profiles:
             return
         
@@ -255,52 +313,60 @@ class WifiDumpGUI:
         
         self.update_table()
         self.update_stats()
-        self.page.update()
     
     def update_table(self):
         """Обновление таблицы профилей"""
         rows = []
         
         for profile in self.filtered_profiles:
-            # Маскируем пароль
-            password_display = profile.key
-            if profile.key and profile.key not in ['No password saved', 'Not found']:
-                password_display = '*' * len(profile.key)
-            
-            # Кнопка показа пароля
-            show_password_btn = ft.IconButton(
-                icon=ft.icons.VISIBILITY,
-                tooltip="Show password",
-                on_click=lambda e, p=profile: self.show_password(p)
-            )
-            
-            # Кнопка копирования
-            copy_btn = ft.IconButton(
-                icon=ft.icons.COPY,
-                tooltip="Copy password",
-                on_click=lambda e, p=profile: self.copy_password(p)
-            )
-            
-            row = ft.DataRow(
-                cells=[
-                    ft.DataCell(ft.Text(profile.ssid, size=12)),
-                    ft.DataCell(ft.Text(profile.authentication, size=12)),
-                    ft.DataCell(ft.Text(profile.encryption, size=12)),
-                    ft.DataCell(ft.Text(password_display, size=12)),
-                    ft.DataCell(ft.Row([show_password_btn, copy_btn]))
-                ]
-            )
+            # Строки создаются один раз и переиспользуются при фильтрации
+            row = self._row_cache.get(id(profile))
+            if row is None:
+                row = self._build_row(profile)
+                self._row_cache[id(profile)] = row
             rows.append(row)
         
         self.profiles_table.rows = rows
     
+    def _build_row(self, profile: WifiProfile) -> ft.DataRow:
+        """Создание строки таблицы для профиля"""
+        # Маскируем пароль
+        password_display = profile.key
+        if profile.has_password:
+            password_display = '*' * len(profile.key)
+        
+        # Кнопка показа пароля
+        show_password_btn = ft.IconButton(
+            icon=ft.icons.VISIBILITY,
+            tooltip="Show password",
+            on_click=lambda e, p=profile: self.show_password(p)
+        )
+        
+        # Кнопка копирования
+        copy_btn = ft.IconButton(
+            icon=ft.icons.COPY,
+            tooltip="Copy password",
+            on_click=lambda e, p=profile: self.copy_password(p)
+        )
+        
+        return ft.DataRow(
+            cells=[
+                ft.DataCell(ft.Text(profile.ssid, size=12)),
+                ft.DataCell(ft.Text(profile.authentication, size=12)),
+                ft.DataCell(ft.Text(profile.encryption, size=12)),
+                ft.DataCell(ft.Text(password_display, size=12)),
+                ft.DataCell(ft.Row([show_password_btn, copy_btn]))
+            ]
+        )
+    
     def update_stats(self):
         """Обновление статистики"""
-        if not self.profiles:
+        # Статистика рассчитывается один раз в _update_ui_after_extraction
+        stats = self._cached_stats
+        if not self.profiles or stats is None:
             self.stats_text.value = "No profiles loaded"
             return
         
-        stats = self.extractor.get_stats()
         filtered_count = len(self.filtered_profiles)
         
         self.stats_text.value = (
@@ -341,7 +407,7 @@ class WifiDumpGUI:
     
     def copy_password(self, profile: WifiProfile):
         """Копирование пароля в буфер обмена"""
-        if profile.key and profile.key not in ['No password saved', 'Not found']:
+        if profile.has_password:
             self.page.set_clipboard(profile.key)
             self.show_snackbar(f"Password for {profile.ssid} copied to clipboard")
         else:
@@ -389,14 +455,17 @@ class WifiDumpGUI:
     def show_progress(self, message):
         """Показ прогресс бара"""
         self.progress_bar.visible = True
+        self.progress_bar.value = None
         self.status_text.value = message
         self.extract_btn.disabled = True
+        self.refresh_btn.disabled = True
         self.page.update()
     
     def hide_progress(self):
         """Скрытие прогресс бара"""
         self.progress_bar.visible = False
         self.extract_btn.disabled = False
+        self.refresh_btn.disabled = False
         self.page.update()
     
     def show_error(self, message):